@@ -11,7 +11,7 @@ Implements LZW compression with LRU eviction, using an OPTIMIZED signaling strat
 - This reduces EVICT_SIGNAL size by ~57% (34 bits vs 123 bits for 10-char entry)
 
 How It Works:
-1. Encoder tracks all evicted codes in a dictionary (like Optimization 1)
+1. Encoder tracks pending evicted codes in a flat list indexed by code (evicted_prefix)
 2. Encoder maintains circular buffer of last 255 outputs with HashMap for O(1) lookup
 3. When about to output a code that was recently evicted:
    a. Find prefix in output history using O(1) HashMap lookup
@@ -21,9 +21,16 @@ How It Works:
 5. Both stay synchronized through LRU tracking and output history mirroring
 
 Data Structure:
-- Doubly-linked list + HashMap for O(1) LRU operations
-- Sentinel head/tail nodes eliminate edge cases
-- Output history: Circular buffer (last 255 outputs) with HashMap (string -> index)
+- OrderedDict of codes (C-level doubly-linked list) for O(1) LRU operations
+- Output history: deque of the last 255 outputs, plus history_index (bytes phrase ->
+  absolute position of its latest output), bounded to the current window
+- Phrases are stored as bytes end to end (no chr/ord/encode in the hot loops)
+
+Performance Notes:
+- Pure standard library on purpose: runs anywhere python3 does, no build step
+- The per-byte loops are compute-bound on interpreter dispatch, so the work
+  goes into doing less per byte (table lookups, fewer calls, batched I/O)
+  rather than into a JIT/native kernel that would add numba/numpy deps
 
 EVICT_SIGNAL Format (Compact - used ~95% of time):
 - [EVICT_SIGNAL][code][offset][suffix][code_again]
@@ -41,17 +48,27 @@ Usage:
 """
 
 
+import os
 import sys
+import mmap
+import stat
 import argparse
-from typing import TypeVar, Generic, Optional, Dict
+from collections import OrderedDict, deque
+from contextlib import nullcontext
+from typing import List, Optional
 
 # Predefined alphabets - add more here as needed
+# Stored as raw bytes: the whole pipeline works on bytes, never on str
 ALPHABETS = {
-    'ascii': [chr(i) for i in range(128)],         # Standard ASCII (0-127)
-    'extendedascii': [chr(i) for i in range(256)], # Extended ASCII (0-255)
-    'ab': ['a', 'b']                               # Binary alphabet for testing
+    'ascii': bytes(range(128)),          # Standard ASCII (0-127)
+    'extendedascii': bytes(range(256)),  # Extended ASCII (0-255)
+    'ab': b'ab'                          # Binary alphabet for testing
 }
 
+# All 256 single-byte bytes objects, built once: SINGLE_BYTES[b] == bytes((b,))
+# Avoids allocating a new 1-byte object for every input byte in the hot loops
+SINGLE_BYTES = tuple(bytes((b,)) for b in range(256))
+
 # ============================================================================
 # BIT-LEVEL I/O CLASSES
 # ============================================================================
@@ -64,16 +81,20 @@ class BitWriter:
 
     How it works:
     1. Accumulates bits in an integer buffer
-    2. When buffer has ≥8 bits, extract and write one byte to file
+    2. When buffer has ≥8 bits, extract one byte into the output bytearray
     3. Clear written bits to prevent memory leak
+    4. Write the bytearray to the file once it reaches FLUSH_SIZE (and on close)
 
     Buffer structure: [HIGH bits: ready to write] [LOW bits: remaining, waiting for more]
                        ^^^^^^^^^^^^^^^^^^^^^^^^   ^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
                        Extracted when ≥8 bits      Counted by n_bits
     """
 
+    FLUSH_SIZE = 1 << 16  # Bytes collected in self.out before each file.write()
+
     def __init__(self, filename):
         self.file = open(filename, 'wb')
+        self.out = bytearray()  # Completed bytes not yet written to the file
         self.buffer = 0   # Integer accumulating bits
         self.n_bits = 0   # Count of remaining bits in buffer (LOW bits, not yet written)
 
@@ -100,23 +121,88 @@ class BitWriter:
             #          buffer >> 1 = 0b10000000 (the HIGH 8 bits)
             # After clearing inside loop, buffer always has ≤ n_bits, so this gives exactly 8 bits
             byte = self.buffer >> self.n_bits
-            self.file.write(bytes([byte]))
+            self.out.append(byte)
 
             # Clear written bits immediately to prevent memory leak
             # After this, buffer has only n_bits (the remaining bits)
             # This ensures next extraction gives exactly 8 bits (no mask needed!)
             self.buffer &= (1 << self.n_bits) - 1
 
+        # Hand completed bytes to the file in large chunks, not one call per byte
+        if len(self.out) >= self.FLUSH_SIZE:
+            self.file.write(self.out)
+            self.out.clear()
+
+    def writer_for(self, num_bits):
+        """
+        Return a write function specialized for a fixed bit width.
+
+        Example: write_code = writer.writer_for(9); write_code(257)
+
+        The width is bound into the closure, so the hot loop calls write_code(value)
+        instead of passing code_bits on every call. Callers fetch a new writer
+        whenever their code width changes.
+
+        Uses the buffer as a 64-bit accumulator: codes are only shifted in until
+        64 bits are pending, then 8 bytes are extracted with one to_bytes() call.
+        Most calls are a shift and an OR (e.g. ~5 of every 6 calls for 12-bit
+        codes), instead of a byte-by-byte drain loop on every call.
+        """
+        out = self.out
+        flush_size = self.FLUSH_SIZE
+
+        def write_fixed(value):
+            n_bits = self.n_bits + num_bits
+            if n_bits < 64:
+                # Fewer than 8 complete bytes pending - just accumulate
+                self.buffer = (self.buffer << num_bits) | value
+                self.n_bits = n_bits
+                return
+            # Extract the high 64 bits as 8 bytes, keep the low n_bits - 64 bits
+            n_bits -= 64
+            buffer = (self.buffer << num_bits) | value
+            out.extend((buffer >> n_bits).to_bytes(8, 'big'))
+            self.buffer = buffer & ((1 << n_bits) - 1)
+            self.n_bits = n_bits
+            if len(out) >= flush_size:
+                self.file.write(out)
+                out.clear()
+        return write_fixed
+
+    def write_bytes(self, data):
+        """
+        Write a whole bytes object (8 bits per byte) in one step.
+
+        Equivalent to calling write(b, 8) for each byte, but does a single shift
+        of the buffer instead of one Python call per byte. When the buffer is
+        byte-aligned (n_bits == 0) the data is appended unchanged.
+        """
+        if self.n_bits == 0:
+            self.out += data
+        else:
+            # Append all bytes to the RIGHT (low bits) at once, then extract len(data)
+            # whole bytes from the LEFT; the same n_bits leftover bits remain
+            num_bits = 8 * len(data)
+            self.buffer = (self.buffer << num_bits) | int.from_bytes(data, 'big')
+            self.out += (self.buffer >> self.n_bits).to_bytes(len(data), 'big')
+            self.buffer &= (1 << self.n_bits) - 1
+        if len(self.out) >= self.FLUSH_SIZE:
+            self.file.write(self.out)
+            self.out.clear()
+
     def close(self):
         """Flush any remaining bits (padded with zeros) and close file."""
         if self.n_bits > 0:
-            # Remaining bits are in LOW positions, shift LEFT to fill a byte
+            # Remaining bits are in LOW positions, shift LEFT to fill whole bytes
             # Example: buffer=0b101 (3 bits) → shift left 5 → 0b10100000
             # This pads the RIGHT side with zeros
-            # Since buffer is cleared after each write, it only has n_bits,
-            # so shifting gives a value in range [0, 255] (no mask needed)
-            byte = self.buffer << (8 - self.n_bits)
-            self.file.write(bytes([byte]))
+            # A fixed-width writer may have left up to 63 bits, so this can be
+            # several bytes; since the buffer only has n_bits, no mask is needed
+            pad = -self.n_bits % 8
+            num_bytes = (self.n_bits + pad) // 8
+            self.out += (self.buffer << pad).to_bytes(num_bytes, 'big')
+        self.file.write(self.out)
+        self.out.clear()
         self.file.close()
 
 class BitReader:
@@ -124,6 +210,8 @@ class BitReader:
     Reads variable-width integers from a stream of bits in a binary file.
 
     Mirrors BitWriter - accumulates bytes into buffer, extracts requested bits.
+    The whole file is read into memory once and indexed by position, instead of
+    one file.read(1) call (and one 1-byte bytes object) per input byte.
 
     Buffer structure: [HIGH bits: ready to extract] [LOW bits: remaining from last byte]
                        ^^^^^^^^^^^^^^^^^^^^^^^^^^^   ^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^^
@@ -131,7 +219,9 @@ class BitReader:
     """
 
     def __init__(self, filename):
-        self.file = open(filename, 'rb')
+        with open(filename, 'rb') as f:
+            self.data = f.read()  # Entire compressed file
+        self.pos = 0      # Index of the next unread byte in data
         self.buffer = 0   # Integer accumulating bits read from file
         self.n_bits = 0   # Count of remaining bits in buffer (LOW bits, not yet extracted)
 
@@ -148,11 +238,11 @@ class BitReader:
         """
         # Fill buffer until we have enough bits
         while self.n_bits < num_bits:
-            byte_data = self.file.read(1)
-            if not byte_data:
+            if self.pos >= len(self.data):
                 return None  # End of file
             # Add byte to the RIGHT (low bits), old bits shift LEFT (high bits)
-            self.buffer = (self.buffer << 8) | byte_data[0]
+            self.buffer = (self.buffer << 8) | self.data[self.pos]
+            self.pos += 1
             self.n_bits += 8
 
         # Extract the requested bits from the LEFT (high bits)
@@ -170,80 +260,113 @@ class BitReader:
 
         return value
 
+    def reader_for(self, num_bits):
+        """
+        Return a read function specialized for a fixed bit width.
+
+        Mirrors BitWriter.writer_for: read_code() behaves like read(num_bits).
+        """
+        data = self.data
+        size = len(data)
+
+        def read_fixed():
+            while self.n_bits < num_bits:
+                if self.pos >= size:
+                    return None  # End of file
+                self.buffer = (self.buffer << 8) | data[self.pos]
+                self.pos += 1
+                self.n_bits += 8
+            self.n_bits -= num_bits
+            value = self.buffer >> self.n_bits
+            self.buffer &= (1 << self.n_bits) - 1
+            return value
+        return read_fixed
+
+    def read_bytes(self, count):
+        """
+        Read 'count' whole bytes (8 bits each) in one step. Returns None at EOF.
+
+        Mirrors BitWriter.write_bytes: equivalent to count calls of read(8).
+        """
+        data = self.data[self.pos:self.pos + count]
+        if len(data) < count:
+            return None  # End of file
+        self.pos += count
+        if self.n_bits == 0:
+            return data
+        # Append the new bytes on the RIGHT, extract the high 8*count bits
+        num_bits = 8 * count
+        self.buffer = (self.buffer << num_bits) | int.from_bytes(data, 'big')
+        value = (self.buffer >> self.n_bits).to_bytes(count, 'big')
+        self.buffer &= (1 << self.n_bits) - 1
+        return value
+
     def close(self):
-        """Close the input file."""
-        self.file.close()
+        """Release the input data (the file itself was closed after reading)."""
+        self.data = b''
+        self.pos = 0
 
 # ============================================================================
 # LRU TRACKER DATA STRUCTURE
 # ============================================================================
 
-K = TypeVar('K')  # Key type (can be str, int, or any hashable type)
-
-class LRUTracker(Generic[K]):
+class LRUTracker:
     """
-    O(1) LRU tracker using doubly-linked list + HashMap.
-    Works with any hashable key type (strings, integers, etc).
+    O(1) LRU tracker for integer codes, backed by an OrderedDict.
 
-    Type-safe generic class: LRUTracker[str] for strings, LRUTracker[int] for ints.
+    OrderedDict keeps its keys in a doubly-linked list implemented in C, so
+    moving a key to the MRU end (move_to_end) and finding the LRU key (first
+    key) cost one C call each, instead of the pointer splicing a hand-rolled
+    linked list does in Python bytecode.
+
+    Layout: keys in order from least recently used (first) to most recently
+    used (last); values are unused (None).
     """
-    __slots__ = ('map', 'head', 'tail')  # Memory optimization
+    __slots__ = ('order', 'touch')  # Memory optimization
 
-    class Node:
-        __slots__ = ('key', 'prev', 'next')  # Memory optimization: ~40% less memory per node
+    def __init__(self) -> None:
+        self.order: OrderedDict = OrderedDict()
+        # Mark an already tracked key as most recently used (KeyError if not tracked)
+        # Hot loops bind this directly once every code they touch is tracked
+        self.touch = self.order.move_to_end
 
-        def __init__(self, key: Optional[K]) -> None:
-            self.key: Optional[K] = key
-            self.prev: Optional['LRUTracker.Node'] = None
-            self.next: Optional['LRUTracker.Node'] = None
+    def use(self, key: int) -> None:
+        """
+        Mark key as recently used. Adds key if not present.
 
-    def __init__(self) -> None:
-        self.map: Dict[K, 'LRUTracker.Node'] = {}
-        self.head: LRUTracker.Node = self.Node(None)
-        self.tail: LRUTracker.Node = self.Node(None)
-        self.head.next = self.tail
-        self.tail.prev = self.head
-
-    def use(self, key: K) -> None:
-        """Mark key as recently used. Adds key if not present."""
-        node = self.map.get(key)
-        if node is not None:
-            # Key exists - move to front (most recently used)
-            self._remove_node(node)
-            self._add_to_front(node)
+        Only needed when the dictionary starts out full, so there is no fill
+        log to load(); otherwise the hot loops use touch().
+        """
+        order = self.order
+        if key in order:
+            order.move_to_end(key)
         else:
-            # New key - add to front
-            node = self.Node(key)
-            self.map[key] = node
-            self._add_to_front(node)
-
-    def find_lru(self) -> Optional[K]:
-        """Return least recently used key, or None if empty."""
-        if self.tail.prev == self.head:
-            return None
-        return self.tail.prev.key
-
-    def remove(self, key: K) -> None:
-        """Remove key from tracking."""
-        node = self.map.pop(key, None)
-        if node is not None:
-            self._remove_node(node)
-
-    def contains(self, key: K) -> bool:
-        """Check if key is being tracked."""
-        return key in self.map
-
-    def _add_to_front(self, node: 'LRUTracker.Node') -> None:
-        """Add node after head (most recently used position)."""
-        node.next = self.head.next
-        node.prev = self.head
-        self.head.next.prev = node  # type: ignore
-        self.head.next = node
-
-    def _remove_node(self, node: 'LRUTracker.Node') -> None:
-        """Remove node from list (maintains links)."""
-        node.prev.next = node.next  # type: ignore
-        node.next.prev = node.prev  # type: ignore
+            order[key] = None
+
+    def recycle(self) -> Optional[int]:
+        """
+        Return the least recently used key and mark it most recently used.
+
+        Used when the LRU code is evicted and immediately reused for a new
+        entry, so finding and touching it is a single call. Returns None if empty.
+        """
+        order = self.order
+        for key in order:
+            order.move_to_end(key)
+            return key
+        return None
+
+    def load(self, touches: List[int]) -> None:
+        """
+        Build the order from a log of use() calls, in one pass.
+
+        Leaves the tracker exactly as if use(key) had been called for each key
+        in order. The tracker must be empty.
+        """
+        # Most recent touch of each key first (dict keeps first-seen order),
+        # then reversed so the least recently used key comes first
+        mru_first = dict.fromkeys(reversed(touches))
+        self.order.update(dict.fromkeys(reversed(mru_first)))
 
 # ============================================================================
 # LZW COMPRESSION WITH OPTIMIZATION 2 (Output History + O(1) HashMap)
@@ -255,14 +378,14 @@ def compress(input_file, output_file, alphabet_name, min_bits=9, max_bits=16):
 
     Algorithm:
     1. Initialize dictionary with single-character entries from alphabet
-    2. Read input character by character (streaming - handles huge files)
+    2. Memory-map the input (or read it once if it is a pipe) and scan it byte by byte
     3. Find longest match in dictionary
     4. Output code for match, add (match + next_char) to dictionary
     5. When dictionary fills (2^max_bits entries), evict LRU entry before adding new one
     6. Track recent outputs in circular buffer for EVICT_SIGNAL reconstruction
 
     LRU Eviction Details:
-    - Track dictionary entries (not alphabet) with LRUTracker
+    - Track dictionary codes (not alphabet) with LRUTracker, keyed by integer code
     - When dictionary is full, evict LRU and reuse its code position
     - Send EVICT_SIGNAL during special case of immediate reuse after eviction
     - Use output history to send compact offset+suffix instead of full entry
@@ -271,7 +394,8 @@ def compress(input_file, output_file, alphabet_name, min_bits=9, max_bits=16):
 
     Output History Details (OPTIMIZATION 2.1):
     - Maintain circular buffer of last 255 outputs
-    - Use HashMap for O(1) prefix lookup (maps string -> global index)
+    - Use history_index for O(1) prefix lookup (maps bytes phrase -> absolute position,
+      only for phrases still inside the window)
     - When eviction happens, check if prefix is in recent history
     - If yes: Send compact format [offset][suffix] (2 bytes)
     - If no: Fall back to full entry format
@@ -295,7 +419,9 @@ def compress(input_file, output_file, alphabet_name, min_bits=9, max_bits=16):
     Uses output history to send compact offset+suffix format when possible.
     """
     alphabet = ALPHABETS[alphabet_name]
-    valid_chars = set(alphabet)
+
+    # Single-byte phrases for each alphabet symbol (e.g. b'a', b'b')
+    alphabet_entries = [SINGLE_BYTES[b] for b in alphabet]
 
     # Write file header containing compression parameters
     # This allows decoder to reconstruct alphabet and settings
@@ -303,12 +429,17 @@ def compress(input_file, output_file, alphabet_name, min_bits=9, max_bits=16):
     writer.write(min_bits, 8)        # 8 bits: min code width
     writer.write(max_bits, 8)        # 8 bits: max code width
     writer.write(len(alphabet), 16)  # 16 bits: alphabet size (0-65535)
-    for char in alphabet:
-        writer.write(ord(char), 8)   # 8 bits per character code
+    writer.write_bytes(alphabet)     # 8 bits per character code
 
     # Initialize LZW dictionary with single characters
-    # Example: {'a': 0, 'b': 1} for alphabet ['a', 'b']
-    dictionary = {char: i for i, char in enumerate(alphabet)}
+    # Example: {b'a': 0, b'b': 1} for alphabet b'ab'
+    # Note: keyed by phrase bytes, not by chained ints ((prefix_code << 8) | byte).
+    # Chained keys name the prefix by code, and LRU eviction reuses codes, so every
+    # eviction would also have to detach the entries filed under the evicted code
+    # and re-file them when that prefix phrase comes back. With that bookkeeping
+    # compression measured 20-40% slower (large.txt, all.tar), while concatenating
+    # short bytes phrases is already cheap.
+    dictionary = {char: i for i, char in enumerate(alphabet_entries)}
 
     # Reserve codes:
     # - len(alphabet): EOF marker
@@ -322,230 +453,262 @@ def compress(input_file, output_file, alphabet_name, min_bits=9, max_bits=16):
     # Variable-width encoding parameters
     code_bits = min_bits                # Current bit width (starts at min_bits)
     threshold = 1 << code_bits          # When to increment bit width (2^code_bits)
+    write_code = writer.writer_for(code_bits)  # Writer specialized for current width
 
-    # LRU tracker for dictionary entries (NOT alphabet entries)
-    # Tracks only multi-character sequences added during compression
+    # LRU tracker for dictionary codes (NOT alphabet codes)
+    # Keyed by integer code (cheap int hash) rather than by phrase string
     lru_tracker = LRUTracker()
 
+    # Nothing is evicted until the dictionary is full, so while it fills, touches
+    # are only logged (one list append) and replayed into lru_tracker in one pass
+    # when next_code reaches EVICT_SIGNAL. lru_use is the current touch function.
+    lru_touches = []
+    lru_use = lru_touches.append if next_code < EVICT_SIGNAL else lru_tracker.use
+
+    # Reverse mapping: code -> phrase, so eviction can find the LRU phrase from its code
+    code_to_entry = [None] * max_size
+    for i, char in enumerate(alphabet_entries):
+        code_to_entry[i] = char
+
     # OPTIMIZATION 1: Track evicted codes and their new values
-    # Key: code that was evicted, Value: (full_entry, prefix_at_eviction_time)
+    # Index: code that was evicted, Value: prefix_at_eviction_time (None = no pending sync)
     # When encoder outputs a recently-evicted code, decoder won't know the new value
-    # So we send EVICT_SIGNAL to synchronize. This dictionary tracks pending syncs.
+    # So we send EVICT_SIGNAL to synchronize. This list tracks pending syncs.
+    # The new full entry is always code_to_entry[code] (a code evicted again before
+    # being output just gets its prefix overwritten), so only the prefix is stored.
+    # A flat list indexed by code replaces a dict of (entry, prefix) tuples:
+    # one index per output instead of a hash probe, no tuple per eviction.
     # OPTIMIZATION 2: Also store prefix to enable offset+suffix reconstruction
-    evicted_codes = {}
+    # Note: this cannot be collapsed to a single "pending code" slot. Once the
+    # dictionary is full every addition evicts, and most evicted codes are not
+    # output again soon, so hundreds of syncs are pending at once
+    # (e.g. ~580 for medium.txt at 10 bits, ~1070 for code.txt at 11 bits).
+    evicted_prefix = [None] * max_size
 
     # OPTIMIZATION 2.1: Output history with O(1) HashMap lookup
     # Circular buffer of last 255 outputs (8-bit offset limit)
     # HashMap enables O(1) prefix lookup vs O(255*L) linear search
-    # Memory cost: ~4KB (8.7% overhead) for 3800x speedup
+    # deque(maxlen) drops the oldest output in O(1) (list.pop(0) is O(n)), and
+    # history_index only holds phrases still in the window, so it stays bounded
     OUTPUT_HISTORY_SIZE = 255
-    output_history = []           # Circular buffer of recent outputs
-    history_start_idx = 0         # Absolute position of first element in buffer
-    string_to_idx = {}            # Maps string -> absolute position (O(1) lookup)
+    output_history = deque(maxlen=OUTPUT_HISTORY_SIZE)  # Circular buffer of recent outputs
+    history_index = {}            # Maps phrase -> absolute position of its latest output
+    output_count = 0              # Absolute position of the next output
 
-    # Read and compress file byte by byte (streaming for memory efficiency)
-    # Binary mode to handle all file types correctly (text and binary)
-    with open(input_file, 'rb') as f:
-        # Read first byte
-        first_byte = f.read(1)
-
-        # Empty file
-        if not first_byte:
-            writer.write(EOF_CODE, min_bits)  # Just write EOF
-            writer.close()
-            return
-
-        # Convert byte to character for dictionary matching
-        first_char = chr(first_byte[0])
-
-        # Validate first character is in alphabet
-        # This guarantees first codeword in compressed file is valid
-        if first_char not in valid_chars:
-            raise ValueError(f"Byte value {first_byte[0]} at position 0 not in alphabet")
-
-        current = first_char  # Current phrase being matched
-        pos = 1  # Track position for better error messages
-
-        # Main LZW compression loop
-        while True:
-            byte_data = f.read(1)  # Read next byte
-            if not byte_data:          # End of input
-                break
+    # Per-output method calls bound once, so the hot loop skips the attribute lookup
+    history_append = output_history.append
+    lru_recycle = lru_tracker.recycle
 
-            # Convert byte to character
-            char = chr(byte_data[0])
-
-            # Validate character
-            if char not in valid_chars:
-                raise ValueError(f"Byte value {byte_data[0]} at position {pos} not in alphabet")
-            pos += 1
-
-            combined = current + char  # Try extending current phrase
-
-            if combined in dictionary:
-                # Phrase exists in dictionary - keep extending
-                # Don't update LRU yet - only update when we actually output the code
-                current = combined
-            else:
-                # Phrase not in dictionary - output code and add new entry
-
-                # About to output code for current phrase
-                output_code = dictionary[current]
-
-                # OPTIMIZATION 2: Check if this code was evicted and is being reused
-                # This is the "evict-then-use" pattern that requires EVICT_SIGNAL
-                if output_code in evicted_codes:
-                    # Encoder is about to use a code that was evicted!
-                    # Decoder won't know the new value - SEND SIGNAL
-
-                    # Unpack stored entry and prefix
-                    entry, prefix = evicted_codes[output_code]
-
-                    # Compute suffix (character that extends prefix to entry)
-                    # Entry format: prefix + suffix (where suffix is always 1 char in LZW)
-                    suffix = entry[len(prefix):]
-                    if len(suffix) != 1:
-                        raise ValueError(f"Logic error: suffix should be 1 char, got {len(suffix)}")
-
-                    # OPTIMIZATION 2.1: Try O(1) HashMap lookup for prefix position in output history
-                    # If prefix is in recent history, we can send compact offset+suffix format
-                    offset = None
-                    if prefix in string_to_idx:
-                        prefix_global_idx = string_to_idx[prefix]
-                        # Check if still in valid buffer range (circular buffer may have evicted it)
-                        if prefix_global_idx >= history_start_idx:
-                            # Calculate offset from end of current history
-                            current_end_idx = history_start_idx + len(output_history) - 1
-                            offset = current_end_idx - prefix_global_idx + 1
-
-                    if offset is not None:
-                        if offset > 255:
-                            raise ValueError(f"Bug in circular buffer: offset {offset} exceeds 255! "
-                                            f"history_size={len(output_history)}, prefix_idx={prefix_global_idx}, "
-                                            f"history_start={history_start_idx}")
-                        # Prefix found in recent history! Send compact EVICT_SIGNAL
-                        # Format: [EVICT_SIGNAL][code][offset][suffix]
-                        # Total: code_bits + code_bits + 8 + 8 = 34 bits (for 9-bit codes)
-                        writer.write(EVICT_SIGNAL, code_bits)
-                        writer.write(output_code, code_bits)
-                        writer.write(offset, 8)       # 1 byte offset (1-255)
-                        writer.write(ord(suffix), 8)  # 1 byte suffix
-                    else:
-                        # Prefix not in recent history - fall back to full entry format
-                        # Format: [EVICT_SIGNAL][code][0][entry_length][char1]...[charN]
-                        # offset=0 signals "full entry follows" (0 is never a valid offset)
-                        writer.write(EVICT_SIGNAL, code_bits)
-                        writer.write(output_code, code_bits)
-                        writer.write(0, 8)            # offset=0 signals "full entry follows"
-                        writer.write(len(entry), 16)  # 16 bits for string length
-                        for c in entry:
-                            writer.write(ord(c), 8)   # 8 bits per character
-
-                    # Remove from evicted_codes since we've now synced it
-                    del evicted_codes[output_code]
-
-                # Output code for current phrase (repeated)
-                writer.write(output_code, code_bits)
-
-                # OPTIMIZATION 2.1: Add current output to history with O(1) HashMap tracking
-                # Track global index (absolute position) to handle circular buffer correctly
-                current_global_idx = history_start_idx + len(output_history)
-                output_history.append(current)
-                string_to_idx[current] = current_global_idx  # Update most recent position
-
-                # Maintain circular buffer size (remove oldest when exceeds 255)
-                if len(output_history) > OUTPUT_HISTORY_SIZE:
-                    output_history.pop(0)  # Remove oldest from buffer
-                    history_start_idx += 1  # Slide the window forward
-
-                # Update LRU if current phrase is a tracked entry (not single char from alphabet)
-                if lru_tracker.contains(current):
-                    lru_tracker.use(current)
-
-                # Add new entry to dictionary
-                if next_code < EVICT_SIGNAL:
-                    # Dictionary not full yet - add normally
-
-                    # Check if we need to increase bit width
-                    # When next_code reaches threshold (512, 1024, etc.), we need more bits
-                    if next_code >= threshold and code_bits < max_bits:
-                        code_bits += 1
-                        threshold <<= 1  # Double threshold (bitshift left = multiply by 2)
-
-                    # Add new phrase to dictionary
-                    dictionary[combined] = next_code
-                    lru_tracker.use(combined)  # Mark as most recently used
-                    next_code += 1
-                else:
-                    # Dictionary FULL - evict LRU entry and reuse its code
-                    lru_entry = lru_tracker.find_lru()
-                    if lru_entry is not None:
-                        # Get the code of the LRU entry
-                        lru_code = dictionary[lru_entry]
-
-                        # Remove old entry from dictionary and LRU tracker
-                        del dictionary[lru_entry]
-                        lru_tracker.remove(lru_entry)
-
-                        # Add new entry at evicted code position
-                        dictionary[combined] = lru_code
-                        lru_tracker.use(combined)
-
-                        # OPTIMIZATION 2: Track eviction with both full entry and prefix
-                        # Prefix (current phrase being output) is needed to compute offset+suffix
-                        evicted_codes[lru_code] = (combined, current)
-                        # Note: next_code stays at EVICT_SIGNAL (doesn't increment)
-
-                # Start new phrase with current character
-                current = char
+    def write_evict_signal(code, prefix, code_bits, output_count):
+        """
+        Send EVICT_SIGNAL for a code whose new entry the decoder has not seen yet.
 
-    # Write final phrase
-    final_code = dictionary[current]
+        Shared by the main loop and the final phrase. Only called on the rare
+        evict-then-use path, so the per-code hot path stays inline.
+        """
+        # Stored prefix, and the entry now living at this code
+        entry = code_to_entry[code]
 
-    # Check if final code was evicted
-    if final_code in evicted_codes:
-        entry, prefix = evicted_codes[final_code]
+        # Compute suffix (character that extends prefix to entry)
+        # Entry format: prefix + suffix (where suffix is always 1 char in LZW)
         suffix = entry[len(prefix):]
+        if len(suffix) != 1:
+            raise ValueError(f"Logic error: suffix should be 1 char, got {len(suffix)}")
 
-        # Try O(1) HashMap lookup for prefix position
+        # OPTIMIZATION 2.1: Try O(1) HashMap lookup for prefix position in output history
+        # If prefix is in recent history, we can send compact offset+suffix format
+        # Only phrases still inside the window are indexed
         offset = None
-        if prefix in string_to_idx:
-            prefix_global_idx = string_to_idx[prefix]
-            if prefix_global_idx >= history_start_idx:
-                current_end_idx = history_start_idx + len(output_history) - 1
-                offset = current_end_idx - prefix_global_idx + 1
+        prefix_idx = history_index.get(prefix)
+        if prefix_idx is not None:
+            # Offset counted back from the most recent output (1 = last)
+            offset = output_count - prefix_idx
 
         if offset is not None:
             if offset > 255:
                 raise ValueError(f"Bug in circular buffer: offset {offset} exceeds 255! "
-                                f"history_size={len(output_history)}, prefix_idx={prefix_global_idx}, "
-                                f"history_start={history_start_idx}")
-            # Send compact EVICT_SIGNAL
-            writer.write(EVICT_SIGNAL, code_bits)
-            writer.write(final_code, code_bits)
-            writer.write(offset, 8)
-            writer.write(ord(suffix), 8)
+                                f"history_size={len(output_history)}, prefix_idx={prefix_idx}, "
+                                f"output_count={output_count}")
+            # Prefix found in recent history! Send compact EVICT_SIGNAL
+            # Format: [EVICT_SIGNAL][code][offset][suffix]
+            # Total: code_bits + code_bits + 8 + 8 = 34 bits (for 9-bit codes)
+            # All four fields are packed into one int and written in one call
+            writer.write((EVICT_SIGNAL << (code_bits + 16))
+                         | (code << 16)
+                         | (offset << 8)        # 1 byte offset (1-255)
+                         | suffix[0],           # 1 byte suffix
+                         2 * code_bits + 16)
+        else:
+            # Prefix not in recent history - fall back to full entry format
+            # Format: [EVICT_SIGNAL][code][0][entry_length][char1]...[charN]
+            # offset=0 signals "full entry follows" (0 is never a valid offset)
+            # Header fields packed into one write; the 8-bit offset field is 0
+            writer.write((EVICT_SIGNAL << (code_bits + 24))
+                         | (code << 24)
+                         | len(entry),          # 16 bits for string length
+                         2 * code_bits + 24)
+            writer.write_bytes(entry)     # 8 bits per character
+
+    # Compress file byte by byte over a read-only memory map (pages in lazily)
+    # Binary mode to handle all file types correctly (text and binary)
+    with open(input_file, 'rb') as f:
+        # Map regular files into memory: zero-copy, no read() call per byte.
+        # Pipes, FIFOs and /proc-style files report size 0 and cannot be mapped,
+        # so they (and empty regular files, which mmap rejects) are read in one
+        # f.read() instead; bytes support the same slicing/translate/memoryview
+        st = os.fstat(f.fileno())
+        if stat.S_ISREG(st.st_mode) and st.st_size > 0:
+            source = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
         else:
-            # Fallback: send full entry
-            writer.write(EVICT_SIGNAL, code_bits)
-            writer.write(final_code, code_bits)
-            writer.write(0, 8)
-            writer.write(len(entry), 16)
-            for c in entry:
-                writer.write(ord(c), 8)
+            source = nullcontext(f.read())
+
+        with source as data:
+            # Empty input: just write EOF
+            if len(data) == 0:
+                writer.write(EOF_CODE, min_bits)
+                writer.close()
+                return
+
+            # Validate every character is in alphabet before compressing
+            # This guarantees every codeword in compressed file is valid
+            # translate(None, alphabet) deletes all alphabet bytes in one C call,
+            # so whatever is left of a chunk is invalid; the first leftover byte
+            # locates the error. Not needed when the alphabet covers all 256 bytes.
+            if len(alphabet) < 256:
+                VALIDATE_CHUNK = 1 << 20
+                for start in range(0, len(data), VALIDATE_CHUNK):
+                    chunk = data[start:start + VALIDATE_CHUNK]
+                    invalid = chunk.translate(None, alphabet)
+                    if invalid:
+                        pos = start + chunk.index(invalid[0])
+                        raise ValueError(f"Byte value {invalid[0]} at position {pos} not in alphabet")
+
+            current = SINGLE_BYTES[data[0]]  # Current phrase being matched (bytes)
+            current_code = dictionary[current]  # Its code, kept in step with current
+
+            # Code of each single-byte phrase, by byte value (alphabet bytes only)
+            byte_code = [0] * 256
+            for i, b in enumerate(alphabet):
+                byte_code[b] = i
+
+            # Bound once: the per-byte lookup returns the code directly, so the
+            # code for the phrase being output never needs a second lookup
+            dictionary_get = dictionary.get
+
+            # Main LZW compression loop
+            # Iterate a memoryview of the input (the map, or the bytes read from a
+            # pipe): yields ints directly, no index arithmetic or subscript per byte.
+            # Released before the map (if any) closes.
+            with memoryview(data)[1:] as rest:
+                for b in rest:
+                    char = SINGLE_BYTES[b]  # Next character as a 1-byte bytes object
+
+                    combined = current + char  # Try extending current phrase
+
+                    code = dictionary_get(combined)
+                    if code is not None:
+                        # Phrase exists in dictionary - keep extending
+                        # Don't update LRU yet - only update when we actually output the code
+                        current = combined
+                        current_code = code
+                    else:
+                        # Phrase not in dictionary - output code and add new entry
+
+                        # About to output code for current phrase
+                        output_code = current_code
+
+                        # OPTIMIZATION 2: Check if this code was evicted and is being reused
+                        # This is the "evict-then-use" pattern that requires EVICT_SIGNAL
+                        prefix = evicted_prefix[output_code]
+                        if prefix is not None:
+                            # Encoder is about to use a code that was evicted!
+                            # Decoder won't know the new value - SEND SIGNAL
+                            write_evict_signal(output_code, prefix, code_bits, output_count)
+
+                            # Clear the pending sync since we've now synced it
+                            evicted_prefix[output_code] = None
+
+                        # Output code for current phrase (repeated)
+                        write_code(output_code)
+
+                        # OPTIMIZATION 2.1: Add current output to history with O(1) HashMap tracking
+                        # Track global index (absolute position) to handle circular buffer correctly
+                        if len(output_history) == OUTPUT_HISTORY_SIZE:
+                            # Oldest output is about to fall off the deque; drop its index
+                            # unless the same phrase was output again more recently
+                            oldest = output_history[0]
+                            if history_index[oldest] == output_count - OUTPUT_HISTORY_SIZE:
+                                del history_index[oldest]
+                        history_append(current)
+                        history_index[current] = output_count  # Update most recent position
+                        output_count += 1
+
+                        # Update LRU if current phrase is a tracked entry (not single char from alphabet)
+                        # Every code above EOF_CODE is tracked from the moment it is added and
+                        # eviction reuses codes without untracking them, so a plain int compare
+                        # tells whether the code is tracked (same test the decoder uses)
+                        if output_code > EOF_CODE:
+                            lru_use(output_code)
+
+                        # Add new entry to dictionary
+                        if next_code < EVICT_SIGNAL:
+                            # Dictionary not full yet - add normally
+
+                            # Check if we need to increase bit width
+                            # When next_code reaches threshold (512, 1024, etc.), we need more bits
+                            # No code_bits < max_bits test needed: here next_code < EVICT_SIGNAL,
+                            # so next_code >= threshold implies threshold < 2^max_bits
+                            if next_code >= threshold:
+                                code_bits += 1
+                                threshold <<= 1  # Double threshold (bitshift left = multiply by 2)
+                                write_code = writer.writer_for(code_bits)
+
+                            # Add new phrase to dictionary
+                            dictionary[combined] = next_code
+                            code_to_entry[next_code] = combined
+                            lru_use(next_code)  # Mark as most recently used
+                            next_code += 1
+
+                            # Dictionary just filled - build the LRU list from the log
+                            if next_code == EVICT_SIGNAL:
+                                lru_tracker.load(lru_touches)
+                                lru_touches = None
+                                lru_use = lru_tracker.touch  # Every dictionary code is tracked now
+                        else:
+                            # Dictionary FULL - evict LRU entry and reuse its code
+                            # recycle() also moves the reused code to the MRU end
+                            lru_code = lru_recycle()
+                            if lru_code is not None:
+                                # Remove old entry from dictionary
+                                del dictionary[code_to_entry[lru_code]]
+
+                                # Add new entry at evicted code position
+                                dictionary[combined] = lru_code
+                                code_to_entry[lru_code] = combined
+
+                                # OPTIMIZATION 2: Track eviction by prefix (the full entry is code_to_entry[lru_code])
+                                # Prefix (current phrase being output) is needed to compute offset+suffix
+                                evicted_prefix[lru_code] = current
+                                # Note: next_code stays at EVICT_SIGNAL (doesn't increment)
+
+                        # Start new phrase with current character
+                        current = char
+                        current_code = byte_code[b]
 
-        del evicted_codes[final_code]
+    # Write final phrase
+    final_code = current_code
 
-    writer.write(final_code, code_bits)
+    # Check if final code was evicted
+    prefix = evicted_prefix[final_code]
+    if prefix is not None:
+        write_evict_signal(final_code, prefix, code_bits, output_count)
+        evicted_prefix[final_code] = None
 
-    # Add final output to history
-    current_global_idx = history_start_idx + len(output_history)
-    output_history.append(current)
-    string_to_idx[current] = current_global_idx
+    write_code(final_code)
 
     # Update LRU for final phrase
-    if lru_tracker.contains(current):
-        lru_tracker.use(current)
+    if final_code > EOF_CODE:
+        lru_use(final_code)
 
     # Check if decoder will increment bit width before reading EOF
     # The decoder increments AFTER reading each codeword but BEFORE reading the next
@@ -589,8 +752,8 @@ def decompress(input_file, output_file):
     - Maintain circular buffer of last 255 outputs (same as encoder)
     - When EVICT_SIGNAL received with offset > 0: Reconstruct from output_history[-offset] + suffix
     - When EVICT_SIGNAL received with offset = 0: Read full entry from stream
-    - Decoder only needs list, not HashMap (uses direct indexing: output_history[-offset])
-    - Encoder needs HashMap for reverse lookup (string -> position)
+    - Decoder only needs a deque, not HashMap (uses direct indexing: output_history[-offset])
+    - Encoder needs history_index for reverse lookup (bytes phrase -> position)
 
     Edge cases handled:
     - Empty file: Just EOF marker, create empty output
@@ -610,34 +773,51 @@ def decompress(input_file, output_file):
     min_bits = reader.read(8)
     max_bits = reader.read(8)
     alphabet_size = reader.read(16)
-    alphabet = [chr(reader.read(8)) for _ in range(alphabet_size)]
+    alphabet_bytes = reader.read_bytes(alphabet_size)
+    if alphabet_bytes is None:
+        raise ValueError("Corrupted file: unexpected end of file in header")
+    alphabet = [SINGLE_BYTES[b] for b in alphabet_bytes]
 
     # Initialize dictionary with alphabet
-    # Example: {0: 'a', 1: 'b'} for alphabet ['a', 'b']
-    dictionary = {i: char for i, char in enumerate(alphabet)}
+    # Example: [b'a', b'b', None, ...] for alphabet b'ab'
+    # Codes are dense ints below max_size, so a list indexed by code replaces a
+    # dict: a plain subscript per decoded code instead of a hash lookup
+    max_size = 1 << max_bits
+    dictionary = [None] * max_size
+    dictionary[:alphabet_size] = alphabet
 
     # Reserve codes (must match encoder):
     # - alphabet_size: EOF marker
     # - alphabet_size+1 to max_size-2: dictionary entries
     # - max_size-1: EVICT_SIGNAL
     EOF_CODE = alphabet_size
-    max_size = 1 << max_bits
     EVICT_SIGNAL = max_size - 1
     next_code = alphabet_size + 1  # Next available dictionary code
 
     # Variable-width decoding parameters (must match encoder)
     code_bits = min_bits
     threshold = 1 << code_bits
+    read_code = reader.reader_for(code_bits)  # Reader specialized for current width
 
     # LRU tracker for dictionary entries (NOT alphabet entries)
     # Mirrors encoder's LRU tracker to stay synchronized
     lru_tracker = LRUTracker()
 
+    # As in the encoder, touches are only logged while the dictionary fills
+    # and replayed into lru_tracker once, right before eviction can start
+    lru_touches = []
+    lru_use = lru_touches.append
+
     # OPTIMIZATION 2: Output history for offset-based reconstruction
     # Decoder uses direct indexing: output_history[-offset] which is O(1)
     # No need for HashMap (encoder needs it for reverse lookup)
+    # deque(maxlen) drops the oldest output in O(1) on append (list.pop(0) is O(n))
     OUTPUT_HISTORY_SIZE = 255
-    output_history = []
+    output_history = deque(maxlen=OUTPUT_HISTORY_SIZE)
+
+    # Per-code method calls bound once, so the hot loops skip the attribute lookup
+    history_append = output_history.append
+    lru_recycle = lru_tracker.recycle
 
     # Flag to skip dictionary addition after EVICT_SIGNAL
     # When EVICT_SIGNAL received, encoder already added entry via eviction
@@ -645,7 +825,7 @@ def decompress(input_file, output_file):
     skip_next_addition = False
 
     # Read first codeword
-    codeword = reader.read(code_bits)
+    codeword = read_code()
 
     # Check for file corruption
     if codeword is None:
@@ -658,28 +838,108 @@ def decompress(input_file, output_file):
         return
 
     # Decode first codeword and write to output
-    # First codeword is always part of dictionary
+    # First codeword is always part of dictionary (a single alphabet character)
+    if codeword > alphabet_size:
+        raise ValueError(f"Invalid codeword: {codeword}")
     prev = dictionary[codeword]  # Previous decoded string
 
     # Write output incrementally (streaming - handles huge files)
     # Binary mode to handle all file types correctly (text and binary)
-    with open(output_file, 'wb') as out:
-        out.write(prev.encode('latin-1'))
+    # Decoded phrases are collected in a bytearray and flushed in ~1 MiB chunks,
+    # instead of one out.write() call per decoded code
+    FLUSH_SIZE = 1 << 20
+    out_buffer = bytearray()
+    with open(output_file, 'wb', buffering=FLUSH_SIZE) as out:
+        out_buffer += prev
 
         # Add first output to history
         output_history.append(prev)
 
-        # Main decompression loop
-        while True:
+        # Check if we need to increase bit width before the next read
+        # After this, width can only change when next_code grows, so the check
+        # lives in the dictionary-add branch below instead of running per codeword
+        if next_code >= threshold and code_bits < max_bits:
+            code_bits += 1
+            threshold <<= 1
+            read_code = reader.reader_for(code_bits)
+
+        # Phase 1: dictionary still filling
+        # Every codeword adds a new entry and may bump the code width.
+        # The encoder only evicts once its dictionary is full, and the decoder
+        # fills at the same point, so EVICT_SIGNAL cannot appear in this phase.
+        while next_code < EVICT_SIGNAL:
+            # Read next codeword
+            codeword = read_code()
+
+            # Check for file corruption
+            if codeword is None:
+                raise ValueError("Corrupted file: unexpected end of file (no EOF marker)")
+
+            # Check for EOF
+            if codeword == EOF_CODE:
+                break
+
+            # Decode codeword
+            # While filling, the dictionary holds exactly the codes below next_code
+            # (EOF_CODE was handled above), so an int compare replaces the
+            # "codeword in dictionary" probe before the lookup
+            if codeword < next_code:
+                # Normal case: code exists in dictionary
+                current = dictionary[codeword]
+            elif codeword == next_code:
+                # SPECIAL LZW EDGE CASE:
+                # Encoder output code for entry it's about to add!
+                # This happens when pattern repeats immediately: "aba" -> "ab" + "a"
+                # Encoder sees "ab", outputs code, adds "aba" as next_code
+                # Then sees "aba" and outputs next_code before decoder added it!
+                # Solution: current = prev + first char of prev
+                current = prev + prev[:1]
+            else:
+                # Invalid codeword - corrupted file
+                raise ValueError(f"Invalid codeword: {codeword}")
+
+            # Append decoded string as bytes, flushing when the buffer is full
+            out_buffer += current
+            if len(out_buffer) >= FLUSH_SIZE:
+                out.write(out_buffer)
+                out_buffer.clear()
+
+            # Add to output history (circular buffer, oldest dropped automatically)
+            history_append(current)
+
+            # Add new entry to dictionary (mirror encoder's logic)
+            dictionary[next_code] = prev + current[:1]
+            lru_use(next_code)
+            next_code += 1
+
             # Check if we need to increase bit width
-            # This happens AFTER processing previous codeword, BEFORE reading next one
+            # This happens AFTER processing this codeword, BEFORE reading next one
             # Encoder checks this same condition before writing EOF, so bit widths match
-            if next_code >= threshold and code_bits < max_bits:
+            # next_code <= EVICT_SIGNAL < 2^max_bits here, so code_bits < max_bits always holds
+            if next_code >= threshold:
                 code_bits += 1
                 threshold <<= 1
+                read_code = reader.reader_for(code_bits)
+
+            # Update LRU for the codeword we just used (if it's a dictionary entry)
+            if codeword > alphabet_size:
+                lru_use(codeword)
+
+            # Update previous string for next iteration
+            prev = current
 
+        # Dictionary full (or EOF reached) - build the LRU list from the log
+        lru_tracker.load(lru_touches)
+        lru_touches = None
+        lru_use = lru_tracker.touch  # Every dictionary code is tracked now
+
+        # Phase 2: dictionary full (skipped entirely if EOF was reached while filling)
+        # Every code below EVICT_SIGNAL is now in the dictionary and the width is
+        # fixed, so there is no width check, no next_code update and no special
+        # LZW case. Each addition instead evicts the LRU entry.
+        while codeword != EOF_CODE:
             # Read next codeword
-            codeword = reader.read(code_bits)
+            codeword = read_code()
 
             # Check for file corruption
             if codeword is None:
@@ -695,7 +955,7 @@ def decompress(input_file, output_file):
                 # Format: [EVICT_SIGNAL][code][offset][suffix] or [EVICT_SIGNAL][code][0][full_entry]
 
                 # Read which code is being evicted
-                evicted_code = reader.read(code_bits)
+                evicted_code = read_code()
 
                 # Read offset (1 byte)
                 offset = reader.read(8)
@@ -705,7 +965,7 @@ def decompress(input_file, output_file):
 
                     # Read suffix (1 byte)
                     suffix_byte = reader.read(8)
-                    suffix = chr(suffix_byte)
+                    suffix = SINGLE_BYTES[suffix_byte]
 
                     # Look back in output history to find prefix
                     # offset=1 means last output, offset=2 means second-to-last, etc.
@@ -722,15 +982,14 @@ def decompress(input_file, output_file):
                     # offset=0 signals fallback to full entry format
                     # Read entry length and full entry
                     entry_length = reader.read(16)
-                    new_entry = ''.join(chr(reader.read(8)) for _ in range(entry_length))
-
-                # Remove old entry from LRU tracker (if it's a dictionary entry)
-                if evicted_code in dictionary and evicted_code >= alphabet_size + 1:
-                    lru_tracker.remove(evicted_code)
+                    new_entry = reader.read_bytes(entry_length)
+                    if new_entry is None:
+                        raise ValueError("Corrupted file: unexpected end of file in EVICT_SIGNAL entry")
 
                 # Add new entry at the evicted code position
+                # The code is reused, so use() simply moves it to the MRU end
                 dictionary[evicted_code] = new_entry
-                lru_tracker.use(evicted_code)
+                lru_use(evicted_code)
 
                 # Skip dictionary addition on next iteration
                 # Encoder already added an entry when it evicted
@@ -739,63 +998,39 @@ def decompress(input_file, output_file):
                 # Don't output anything, don't update prev, continue to next code
                 continue
 
-            # Decode codeword
-            if codeword in dictionary:
-                # Normal case: code exists in dictionary
-                current = dictionary[codeword]
-            elif codeword == next_code:
-                # SPECIAL LZW EDGE CASE:
-                # Encoder output code for entry it's about to add!
-                # This happens when pattern repeats immediately: "aba" -> "ab" + "a"
-                # Encoder sees "ab", outputs code, adds "aba" as next_code
-                # Then sees "aba" and outputs next_code before decoder added it!
-                # Solution: current = prev + first char of prev
-                current = prev + prev[0]
-            else:
-                # Invalid codeword - corrupted file
-                raise ValueError(f"Invalid codeword: {codeword}")
+            # Decode codeword (dictionary is full, so every code is present)
+            current = dictionary[codeword]
 
-            # Write decoded string as bytes
-            out.write(current.encode('latin-1'))
+            # Append decoded string as bytes, flushing when the buffer is full
+            out_buffer += current
+            if len(out_buffer) >= FLUSH_SIZE:
+                out.write(out_buffer)
+                out_buffer.clear()
 
-            # Add to output history (circular buffer)
-            output_history.append(current)
-            if len(output_history) > OUTPUT_HISTORY_SIZE:
-                output_history.pop(0)  # Remove oldest from buffer
+            # Add to output history (circular buffer, oldest dropped automatically)
+            history_append(current)
 
-            # Add new entry to dictionary (mirror encoder's logic)
+            # Mirror encoder's LRU eviction
             # Skip if previous iteration received EVICT_SIGNAL
-            if not skip_next_addition:
-                new_entry = prev + current[0]
-
-                if next_code < EVICT_SIGNAL:
-                    # Dictionary not full yet - add normally
-                    dictionary[next_code] = new_entry
-                    lru_tracker.use(next_code)
-                    next_code += 1
-                else:
-                    # Dictionary FULL - mirror encoder's LRU eviction
-                    lru_code = lru_tracker.find_lru()
-                    if lru_code is not None:
-                        # Remove old entry from dictionary and tracker
-                        del dictionary[lru_code]
-                        lru_tracker.remove(lru_code)
-
-                        # Add new entry at evicted code position
-                        dictionary[lru_code] = new_entry
-                        lru_tracker.use(lru_code)
-
-            # Reset skip flag
-            skip_next_addition = False
+            if skip_next_addition:
+                skip_next_addition = False
+            else:
+                # recycle() also moves the reused code to the MRU end
+                lru_code = lru_recycle()
+                if lru_code is not None:
+                    # Overwrite old entry at evicted code position
+                    dictionary[lru_code] = prev + current[:1]
 
             # Update LRU for the codeword we just used (if it's a dictionary entry)
-            if codeword >= alphabet_size + 1 and codeword < EVICT_SIGNAL:
-                if codeword in dictionary:
-                    lru_tracker.use(codeword)
+            if codeword > alphabet_size:
+                lru_use(codeword)
 
             # Update previous string for next iteration
             prev = current
 
+        # Flush remaining decoded output
+        out.write(out_buffer)
+
     reader.close()
 
     print(f"Decompressed: {input_file} -> {output_file}")